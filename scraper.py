@@ -7,16 +7,23 @@
 """
 
 import os
+import re
 import time
-import json
+import asyncio
+import multiprocessing
+import sqlite3
+from contextlib import AsyncExitStack
+from datetime import datetime, timedelta, time as dt_time
 from urllib.parse import urljoin
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Union, Optional
-import requests
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Dict, Tuple, Union, Optional
+import httpx
+import orjson
+from httpx import AsyncClient
+from hishel import AsyncSqliteStorage, CacheOptions, SpecificationPolicy
+from hishel.httpx import AsyncCacheClient
 from typing_extensions import TypeAlias
-from bs4 import BeautifulSoup, Tag
-from requests.sessions import Session
-import schedule
+from lxml import etree, html as lxml_html
 
 # Псевдонимы типов
 BookData: TypeAlias = Dict[str, Union[str, int, None]]
@@ -27,186 +34,491 @@ BookList: TypeAlias = List[BookData]
 BASE_URL = 'https://books.toscrape.com'
 CATALOGUE_URL_TEMPLATE = 'https://books.toscrape.com/catalogue/page-{}.html'
 RATING_MAP = {'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
-DEFAULT_TIMEOUT = 10
-MAX_WORKERS = 10
+# Ожидание свободного соединения в пуле не ограничено: число одновременных
+# запросов и так ограничено семафором
+DEFAULT_TIMEOUT = httpx.Timeout(10, pool=None)
+CATALOGUE_TIMEOUT = httpx.Timeout(5, pool=None)
+ARTIFACTS_DIR = 'artifacts'
+CACHE_PATH = os.path.join(ARTIFACTS_DIR, 'http_cache.sqlite')
+CACHE_TTL = 3 * 24 * 3600
+MAX_CONCURRENCY = 64
+MAX_CONNECTIONS = 4
+KEEPALIVE_TIMEOUT = 60
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DISCOVERY_BATCH_SIZE = 8
+PROGRESS_EVERY = 25
+PAGER_PATTERN = re.compile(r'Page\s+\d+\s+of\s+(\d+)')
+BOOK_LINK_XPATH = etree.XPath('//article[@class="product_pod"]/h3/a/@href')
+PAGER_XPATH = etree.XPath('string(//li[@class="current"])')
+# Строковые поля страницы книги: имя поля -> XPath-выражение
+BOOK_FIELD_XPATHS = {
+    'title': 'string(//h1)',
+    'price': 'string(//p[@class="price_color"])',
+    'rating': 'string(//p[contains(@class, "star-rating")]/@class)',
+    'stock': 'string(//p[@class="instock availability"])',
+    'description': ('string(//div[@id="product_description"]'
+                    '/following-sibling::p[1])'),
+}
+# Из выражений полей генерируется одно выражение concat(...), поэтому все поля
+# извлекаются за один вызов XPath. Разделитель - печатный символ U+241F,
+# так как управляющие символы в XPath-литералах lxml не допускаются
+BOOK_FIELDS_SEPARATOR = '\u241f'
+BOOK_FIELDS_XPATH = etree.XPath(
+    'concat(' + f', "{BOOK_FIELDS_SEPARATOR}", '.join(BOOK_FIELD_XPATHS.values())
+    + ')')
+# Если разделитель встретился в тексте страницы, поля извлекаются по одному
+BOOK_FIELD_FALLBACK_XPATHS = {
+    name: etree.XPath(expression)
+    for name, expression in BOOK_FIELD_XPATHS.items()
+}
+INFO_KEYS_XPATH = etree.XPath(
+    '//table[contains(@class, "table-striped")]//tr[th and td]/th[1]')
+INFO_VALUES_XPATH = etree.XPath(
+    '//table[contains(@class, "table-striped")]//tr[th and td]/td[1]')
+
+
+async def _get_with_retries(
+        client: AsyncClient, url: str,
+        timeout: Optional[httpx.Timeout] = None) -> Tuple[int, bytes]:
+    """
+    Выполняет GET-запрос, повторяя его при сетевых ошибках и ответах
+    с кодами из RETRY_STATUSES (экспоненциальная задержка между попытками)
+
+    Args:
+        client (AsyncClient): Клиент httpx для выполнения запроса
+        url (str): URL запрашиваемой страницы
+        timeout (Optional[httpx.Timeout]): Таймаут запроса. Если None,
+                                           используется таймаут клиента
 
+    Returns:
+        Tuple[int, bytes]: HTTP-статус последнего ответа и его тело
 
-# pylint: disable=too-many-locals
-def get_book_data(session: Session, book_url: str) -> BookData:
+    Raises:
+        httpx.TransportError: Если все попытки завершились сетевой ошибкой
+    """
+    for attempt in range(RETRY_TOTAL):
+        try:
+            response = await client.get(
+                url, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+            if response.status_code not in RETRY_STATUSES:
+                return response.status_code, response.content
+        except httpx.TransportError:
+            pass
+
+        await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+
+    # Последняя попытка: ошибки и статус ответа передаются вызывающему коду
+    response = await client.get(
+        url, timeout=timeout or httpx.USE_CLIENT_DEFAULT)
+    return response.status_code, response.content
+
+
+async def get_book_data(client: AsyncClient, book_url: str,
+                        executor: Optional[Executor] = None) -> BookData:
     """
     Извлекает данные о книге с указанной страницы
 
     Args:
-        session (Session): Сессия requests для выполнения запроса
+        client (AsyncClient): Клиент httpx для выполнения запроса
         book_url (str): URL страницы книги
+        executor (Optional[Executor]): Пул, в котором выполняется разбор
+                                       HTML. Если None, разбор выполняется
+                                       в текущем потоке
 
     Returns:
         BookData: Словарь с данными о книге.
-                  Возвращает пустой словарь в случае ошибки сети.
+                  Возвращает пустой словарь в случае ошибки сети
+                  или пустой страницы.
     """
     try:
-        response = session.get(book_url, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        response.encoding = 'utf-8'
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Извлечение основных данных
-        title_element = soup.find('h1')
-        title = title_element.text.strip() if title_element else None
-
-        price_element = soup.find('p', class_='price_color')
-        price = price_element.text.strip() if price_element else None
-
-        # Извлечение рейтинга
-        rating = 0
-        rating_element = soup.find('p', class_='star-rating')
-        if isinstance(rating_element, Tag) and 'class' in rating_element.attrs:
-            rating_classes = rating_element['class']
-            if isinstance(rating_classes, list) and len(rating_classes) > 1:
-                rating = RATING_MAP.get(rating_classes[1], 0)
-
-        # Извлечение количества в наличии
-        stock_element = soup.find('p', class_='instock availability')
-        stock = stock_element.text.strip() if stock_element else None
-
-        # Извлечение описания
-        description = None
-        description_header = soup.find('div', id='product_description')
-        if description_header:
-            description_element = description_header.find_next_sibling('p')
-            description = description_element.text.strip() \
-                if description_element else None
-
-        # Извлечение характеристик из таблицы
-        info = {}
-        info_table = soup.find('table', class_='table table-striped')
-        if isinstance(info_table, Tag):
-            rows = info_table.find_all('tr')
-            for row in rows:
-                th_element = row.find('th')
-                td_element = row.find('td')
-                if th_element and td_element:
-                    info_key = th_element.text.strip()
-                    info_value = td_element.text.strip()
-                    info[info_key] = info_value
-
-        return {
-            'title': title,
-            'price': price,
-            'rating': rating,
-            'stock': stock,
-            'description': description,
-            'url': book_url,
-            **info
-        }
-
-    except requests.RequestException as exc:
+        status, html = await _get_with_retries(client, book_url)
+    except httpx.HTTPError as exc:
         print(f"Ошибка при загрузке {book_url}: {exc}")
         return {}
 
+    if status >= 400:
+        print(f"Ошибка при загрузке {book_url}: HTTP {status}")
+        return {}
 
-# pylint: disable=too-many-locals, too-many-branches, too-many-statements
-def scrape_books(is_save: bool = False,
-                max_pages: Optional[int] = None) -> BookList:
+    if executor is None:
+        return _parse_book(html, book_url)
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, _parse_book, html, book_url)
+
+
+def _text(value: str) -> Optional[str]:
     """
-    Парсит все страницы каталога и собирает данные о книгах с использованием
-    многопоточности
+    Обрезает пробельные символы в строке, извлечённой из HTML
 
     Args:
-        is_save (bool): Если True, сохраняет данные в файл books_data.txt
-                       в папке artifacts/
-        max_pages (Optional[int]): Максимальное количество страниц для
-                                  парсинга. Если None, парсит все страницы
+        value (str): Результат строкового XPath-выражения
 
     Returns:
-        BookList: Список словарей с данными о книгах
+        Optional[str]: Строка без пробелов по краям или None, если она пуста
     """
-    print("Начало парсинга книг")
+    return value.strip() or None
 
-    with requests.Session() as session:
-        session.headers.update({
-            'User-Agent': 'MyBookScraper (student project)'
-        })
 
-        # Проверка доступности сайта
+def _parse_book(html: bytes, book_url: str) -> BookData:
+    """
+    Разбирает HTML страницы книги. Функция объявлена на уровне модуля,
+    чтобы её можно было выполнять в ProcessPoolExecutor
+
+    Args:
+        html (bytes): Содержимое страницы книги
+        book_url (str): URL страницы книги
+
+    Returns:
+        BookData: Словарь с данными о книге.
+                  Возвращает пустой словарь для пустой страницы
+    """
+    # Исключение обрабатывается здесь же: ParserError не сериализуется
+    # pickle и не может быть передан из процесса пула в основной
+    try:
+        doc = lxml_html.fromstring(html)
+    except etree.ParserError:
+        print(f"Ошибка при загрузке {book_url}: пустая страница")
+        return {}
+
+    # Извлечение основных данных
+    values = BOOK_FIELDS_XPATH(doc).split(BOOK_FIELDS_SEPARATOR)
+    if len(values) == len(BOOK_FIELD_XPATHS):
+        fields = dict(zip(BOOK_FIELD_XPATHS, values))
+    else:
+        fields = {name: xpath(doc)
+                  for name, xpath in BOOK_FIELD_FALLBACK_XPATHS.items()}
+    title = _text(fields['title'])
+    price = _text(fields['price'])
+    stock = _text(fields['stock'])
+    description = _text(fields['description'])
+
+    # Извлечение рейтинга
+    rating = 0
+    rating_words = fields['rating'].split()
+    if len(rating_words) > 1:
+        rating = RATING_MAP.get(rating_words[1], 0)
+
+    # Извлечение характеристик из таблицы
+    info = {
+        th_element.text_content().strip(): td_element.text_content().strip()
+        for th_element, td_element in zip(INFO_KEYS_XPATH(doc),
+                                          INFO_VALUES_XPATH(doc))
+    }
+
+    return {
+        'title': title,
+        'price': price,
+        'rating': rating,
+        'stock': stock,
+        'description': description,
+        'url': book_url,
+        **info
+    }
+
+
+async def _fetch_book(semaphore: asyncio.Semaphore, client: AsyncClient,
+                      book_url: str,
+                      executor: Executor) -> Tuple[str, BookData]:
+    """
+    Загружает данные о книге, ограничивая число одновременных запросов
+
+    Args:
+        semaphore (asyncio.Semaphore): Семафор, ограничивающий параллелизм
+        client (AsyncClient): Клиент httpx для выполнения запроса
+        book_url (str): URL страницы книги
+        executor (Executor): Пул процессов для разбора HTML
+
+    Returns:
+        Tuple[str, BookData]: URL книги и словарь с её данными
+    """
+    async with semaphore:
         try:
-            response = session.get(BASE_URL, timeout=DEFAULT_TIMEOUT)
-            response.raise_for_status()
-            print(f"Сайт {BASE_URL} доступен")
-        except requests.RequestException as exc:
-            print(f"Сайт {BASE_URL} недоступен: {exc}")
-            return []
+            return book_url, await get_book_data(client, book_url, executor)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            print(f"\n[Задача] Ошибка при обработке {book_url}: {exc}")
+            return book_url, {}
 
-        # Сбор всех URL книг
-        all_book_urls = []
-        page = 1
 
-        while True:
-            if max_pages and page > max_pages:
-                break
+async def _prewarm_connections(client: AsyncClient) -> None:
+    """
+    Заранее открывает MAX_CONNECTIONS соединений пула параллельными
+    HEAD-запросами, чтобы последующая волна запросов не устанавливала их
+    одновременно. Ответы не закрываются, пока не будут получены все, поэтому
+    каждый запрос занимает отдельное соединение. Имеет смысл только для
+    HTTP/1.1: по HTTP/2 запросы мультиплексируются в одном соединении.
+    HEAD-запросы не кэшируются политикой клиента и всегда уходят на сервер.
+    Ошибки игнорируются: соединения в этом случае откроются по мере надобности
+
+    Args:
+        client (AsyncClient): Клиент httpx для выполнения запросов
+    """
+    async with AsyncExitStack() as stack:
+        responses = await asyncio.gather(*(
+            stack.enter_async_context(
+                client.stream('HEAD', BASE_URL, timeout=CATALOGUE_TIMEOUT))
+            for _ in range(MAX_CONNECTIONS)
+        ), return_exceptions=True)
+        for response in responses:
+            if isinstance(response, httpx.Response):
+                await response.aread()
+
+
+async def _fetch_catalogue_page(
+        client: AsyncClient,
+        page: int) -> Optional[Tuple[List[str], Optional[int]]]:
+    """
+    Загружает страницу каталога и извлекает из неё ссылки на книги
+
+    Args:
+        client (AsyncClient): Клиент httpx для выполнения запроса
+        page (int): Номер страницы каталога
+
+    Returns:
+        Optional[Tuple[List[str], Optional[int]]]: Список URL книг и общее
+            число страниц из пагинатора (None, если пагинатора нет).
+            Возвращает None, если страница недоступна, и ([], None), если
+            её тело пустое.
+    """
+    page_url = CATALOGUE_URL_TEMPLATE.format(page)
+
+    try:
+        status, html = await _get_with_retries(client, page_url,
+                                               CATALOGUE_TIMEOUT)
+    except httpx.HTTPError as exc:
+        print(f"Ошибка при загрузке страницы {page_url}: {exc}")
+        return None
+
+    if status != 200:
+        print(f"Страница {page} недоступна.")
+        return None
+
+    try:
+        doc = lxml_html.fromstring(html)
+    except etree.ParserError:
+        # Пустое тело ответа: страница считается пустой
+        print(f"Страница {page} пуста.")
+        return [], None
+    book_urls = [urljoin(page_url, href) for href in BOOK_LINK_XPATH(doc)]
+
+    # Пагинатор имеет вид "Page 1 of 50"
+    match = PAGER_PATTERN.search(PAGER_XPATH(doc))
+    total_pages = int(match.group(1)) if match else None
+
+    print(f"Найдено {len(book_urls)} книг на странице {page}")
+    return book_urls, total_pages
 
-            page_url = CATALOGUE_URL_TEMPLATE.format(page)
 
-            try:
-                response = session.get(page_url, timeout=DEFAULT_TIMEOUT)
-                if response.status_code != 200:
-                    print(f"Страница {page} недоступна. Завершение сбора URL.")
-                    break
+async def _collect_book_urls(client: AsyncClient,
+                             max_pages: Optional[int] = None) -> List[str]:
+    """
+    Собирает URL книг со всех страниц каталога. После первой страницы
+    остальные загружаются параллельно: все сразу, если число страниц
+    известно из пагинатора, иначе пакетами удваивающегося размера
 
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.text, 'html.parser')
-                book_links = soup.select('article.product_pod h3 a')
+    Args:
+        client (AsyncClient): Клиент httpx для выполнения запросов
+        max_pages (Optional[int]): Максимальное количество страниц для
+                                  парсинга. Если None, парсит все страницы
 
-                if not book_links:
-                    print(f"Страница {page} пуста. Завершение сбора URL.")
-                    break
+    Returns:
+        List[str]: Список URL книг в порядке следования в каталоге
+    """
+    first_page = await _fetch_catalogue_page(client, 1)
+    if not first_page or not first_page[0]:
+        print("Страница 1 пуста или недоступна. Завершение сбора URL.")
+        return []
+
+    all_book_urls, total_pages = first_page
+
+    if total_pages is not None:
+        last_page = min(total_pages, max_pages) if max_pages else total_pages
+        pages = await asyncio.gather(*(
+            _fetch_catalogue_page(client, page)
+            for page in range(2, last_page + 1)
+        ))
+        for result in pages:
+            if result:
+                all_book_urls.extend(result[0])
+        return all_book_urls
+
+    # Число страниц неизвестно: перебираем их пакетами 2..9, 10..25, ...
+    page = 2
+    batch_size = DISCOVERY_BATCH_SIZE
+    while not max_pages or page <= max_pages:
+        batch_end = page + batch_size
+        if max_pages:
+            batch_end = min(batch_end, max_pages + 1)
+
+        pages = await asyncio.gather(*(
+            _fetch_catalogue_page(client, batch_page)
+            for batch_page in range(page, batch_end)
+        ))
+        for batch_page, result in enumerate(pages, page):
+            if not result or not result[0]:
+                print(f"Страница {batch_page} пуста или недоступна. "
+                      f"Завершение сбора URL.")
+                return all_book_urls
+            all_book_urls.extend(result[0])
+
+        page = batch_end
+        batch_size *= 2
+
+    return all_book_urls
+
+
+async def _scrape_books(
+        executor: Executor,
+        max_pages: Optional[int] = None) -> Tuple[BookList, int]:
+    """
+    Асинхронно собирает URL книг со страниц каталога и загружает данные
+    о книгах
+
+    Args:
+        executor (Executor): Пул процессов для разбора HTML
+        max_pages (Optional[int]): Максимальное количество страниц для
+                                  парсинга. Если None, парсит все страницы
 
-                for link in book_links:
-                    href_value = link.get('href')
+    Returns:
+        Tuple[BookList, int]: Список данных о книгах и число неудачных попыток
+    """
+    # Все запросы идут на один хост, поэтому по HTTP/2 они мультиплексируются
+    # в нескольких долгоживущих соединениях, а не открывают новые для каждой книги
+    limits = httpx.Limits(max_connections=MAX_CONNECTIONS,
+                          max_keepalive_connections=MAX_CONNECTIONS,
+                          keepalive_expiry=KEEPALIVE_TIMEOUT)
+    # Ответы кэшируются на диске, но каждый запрос отправляется с
+    # Cache-Control: no-cache, поэтому сохранённая страница всегда
+    # перепроверяется условным запросом (If-Modified-Since/If-None-Match).
+    # Неизменившиеся страницы приходят как короткий ответ 304, а изменения
+    # цены или наличия не скрываются кэшем
+    os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+    # Срок хранения записи больше интервала между запусками, поэтому страницы
+    # обычно перепроверяются ответом 304. Ответ 304 не продлевает срок записи
+    # в hishel, так что раз в CACHE_TTL страница скачивается целиком заново
+    storage = AsyncSqliteStorage(database_path=CACHE_PATH,
+                                 default_ttl=CACHE_TTL)
+    # HEAD-запросы не кэшируются: проверка доступности сайта должна
+    # обращаться к серверу, а не к сохранённому ответу
+    policy = SpecificationPolicy(
+        cache_options=CacheOptions(supported_methods=['GET']))
+    async with AsyncCacheClient(
+            storage=storage,
+            policy=policy,
+            http2=True,
+            limits=limits,
+            timeout=DEFAULT_TIMEOUT,
+            follow_redirects=True,
+            headers={
+                'User-Agent': 'MyBookScraper (student project)',
+                'Accept': 'text/html',
+                'Accept-Encoding': 'gzip, deflate, br',
+                'Cache-Control': 'no-cache'
+            }
+    ) as client:
 
-                    if isinstance(href_value, str):
-                        book_url = urljoin(page_url, href_value)
-                        all_book_urls.append(book_url)
+        # Проверка доступности сайта (достаточно заголовков, без тела страницы)
+        try:
+            response = await client.head(BASE_URL, timeout=CATALOGUE_TIMEOUT)
+            response.raise_for_status()
+            print(f"Сайт {BASE_URL} доступен")
+        except httpx.HTTPError as exc:
+            print(f"Сайт {BASE_URL} недоступен: {exc}")
+            return [], 0
 
-                print(f"Найдено {len(book_links)} книг на странице {page}")
-                page += 1
+        await _prewarm_connections(client)
 
-            except requests.RequestException as exc:
-                print(f"Ошибка при загрузке страницы {page_url}: {exc}")
-                break
+        # Сбор всех URL книг
+        all_book_urls = await _collect_book_urls(client, max_pages)
 
         print(f"Всего найдено {len(all_book_urls)} книг для парсинга")
 
         if not all_book_urls:
             print("Не найдено ни одной книги для парсинга")
-            return []
+            return [], 0
 
         parsed_books = []
         failed_count = 0
         total_books = len(all_book_urls)
-        print(f"Запуск {MAX_WORKERS} потоков для обработки {total_books} книг...")
+        print(f"Запуск {total_books} задач (не более {MAX_CONCURRENCY} "
+              f"одновременно) для обработки книг...")
 
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            futures = {
-                executor.submit(get_book_data, session, url): url
-                for url in all_book_urls
-            }
+        # Загрузка страниц идёт в цикле событий, а разбор HTML (работа CPU)
+        # распределяется по процессам, чтобы задействовать все ядра
+        semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        tasks = [_fetch_book(semaphore, client, url, executor)
+                 for url in all_book_urls]
+
+        for i, next_task in enumerate(asyncio.as_completed(tasks), 1):
+            url, book_data = await next_task
+            if book_data:
+                parsed_books.append(book_data)
+            else:
+                failed_count += 1
+                print(f"\n[Задача] Не удалось получить данные для: {url}")
+
+            if i % PROGRESS_EVERY == 0 or i == total_books:
+                print(f"Обработано: {i}/{total_books} "
+                      f"(Ошибок: {failed_count})", end="\r")
+
+    return parsed_books, failed_count
 
-            for i, future in enumerate(as_completed(futures), 1):
-                url = futures[future]
-                try:
-                    book_data = future.result()
-                    if book_data:
-                        parsed_books.append(book_data)
-                    else:
-                        failed_count += 1
-                        print(f"\n[Поток] Не удалось получить данные для: {url}")
-                except Exception as exc:
-                    failed_count += 1
-                    print(f"\n[Поток] Ошибка при обработке {url}: {exc}")
-
-                print(f"Обработано: {i}/{total_books} (Ошибок: {failed_count})",
-                      end="\r")
+
+def _prune_http_cache() -> None:
+    """
+    Удаляет из кэша HTTP записи старше CACHE_TTL и записи, вытесненные более
+    новым ответом для того же URL. Сам hishel удаляет их не раньше чем через
+    5 минут после открытия хранилища, а запуск парсера обычно короче,
+    поэтому без этого файл кэша рос бы бесконечно
+    """
+    if not os.path.exists(CACHE_PATH):
+        return
+
+    try:
+        with sqlite3.connect(CACHE_PATH) as connection:
+            # Фрагменты тела ответа удаляются каскадно по внешнему ключу
+            connection.execute('PRAGMA foreign_keys=ON')
+            connection.execute(
+                'DELETE FROM entries WHERE created_at < ? OR created_at < '
+                '(SELECT MAX(newer.created_at) FROM entries AS newer '
+                'WHERE newer.cache_key = entries.cache_key)',
+                (time.time() - CACHE_TTL,))
+        connection.close()
+    except sqlite3.Error as exc:
+        print(f"Ошибка при очистке кэша {CACHE_PATH}: {exc}")
+
+
+def scrape_books(is_save: bool = False,
+                max_pages: Optional[int] = None) -> BookList:
+    """
+    Парсит все страницы каталога и собирает данные о книгах с использованием
+    асинхронных запросов (asyncio + httpx по HTTP/2)
+
+    Args:
+        is_save (bool): Если True, сохраняет данные в файл books_data.txt
+                       в папке artifacts/
+        max_pages (Optional[int]): Максимальное количество страниц для
+                                  парсинга. Если None, парсит все страницы
+
+    Returns:
+        BookList: Список словарей с данными о книгах
+    """
+    print("Начало парсинга книг")
+
+    # Пул создаётся до запуска цикла событий, а процессы запускаются методом
+    # spawn: fork процесса, в котором уже работают потоки цикла событий
+    # и httpx, может унаследовать захваченные ими блокировки
+    with ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        parsed_books, failed_count = asyncio.run(
+            _scrape_books(executor, max_pages))
+    _prune_http_cache()
+
+    if not parsed_books and not failed_count:
+        return []
 
     print()
     print("=" * 30)
@@ -230,12 +542,12 @@ def save_books_data(book_list: BookList,
         filename (str): Имя файла для сохранения
     """
     try:
-        artifacts_dir = 'artifacts'
-        os.makedirs(artifacts_dir, exist_ok=True)
-        filepath = os.path.join(artifacts_dir, filename)
+        os.makedirs(ARTIFACTS_DIR, exist_ok=True)
+        filepath = os.path.join(ARTIFACTS_DIR, filename)
 
-        with open(filepath, 'w', encoding='utf-8') as file:
-            json.dump(book_list, file, ensure_ascii=False, indent=4)
+        # orjson сразу выдаёт UTF-8 байты, поэтому файл открывается в режиме 'wb'
+        with open(filepath, 'wb') as file:
+            file.write(orjson.dumps(book_list, option=orjson.OPT_INDENT_2))
 
         print(f"Данные о {len(book_list)} книгах сохранены в {filepath}")
 
@@ -258,24 +570,49 @@ def run_scraper() -> None:
         print(f"Ошибка при выполнении парсинга: {exc}")
 
 
+def next_run_time(run_times: List[dt_time], now: datetime) -> datetime:
+    """
+    Вычисляет ближайший момент запуска среди ежедневных времён запуска
+
+    Args:
+        run_times (List[dt_time]): Времена ежедневного запуска
+        now (datetime): Текущий момент
+
+    Returns:
+        datetime: Ближайший момент запуска строго позже now
+    """
+    candidates = []
+    for run_time in run_times:
+        candidate = datetime.combine(now.date(), run_time)
+        if candidate <= now:
+            candidate += timedelta(days=1)
+        candidates.append(candidate)
+    return min(candidates)
+
+
 def main_loop(target_time: str = "12:00", test_delay: int = 60) -> None:
     """
-    Основной цикл для проверки и выполнения задач по расписанию
+    Основной цикл для выполнения задач по расписанию. Между запусками
+    процесс спит ровно до ближайшего времени запуска, не просыпаясь
+    для периодических проверок
     """
-    schedule.every().day.at(target_time).do(run_scraper)
+    run_times = [datetime.strptime(target_time, "%H:%M").time()]
     print(f"Планировщик настроен на запуск каждый день в {target_time}")
 
     if test_delay:
-        test_time_dt = time.localtime(time.time() + test_delay)
-        test_time_str = time.strftime("%H:%M:%S", test_time_dt)
-        schedule.every().day.at(test_time_str).do(run_scraper)
-        print(f"Добавлен тестовый запуск в {test_time_str}")
+        test_time = (datetime.now() + timedelta(seconds=test_delay)).time()
+        test_time = test_time.replace(microsecond=0)
+        run_times.append(test_time)
+        print(f"Добавлен тестовый запуск в {test_time:%H:%M:%S}")
 
     try:
         print("Запуск основного цикла планировщика")
         while True:
-            schedule.run_pending()
-            time.sleep(60)
+            now = datetime.now()
+            next_run = next_run_time(run_times, now)
+            print(f"Следующий запуск в {next_run:%Y-%m-%d %H:%M:%S}")
+            time.sleep((next_run - now).total_seconds())
+            run_scraper()
     except KeyboardInterrupt:
         print("\nПолучен сигнал прерывания. Остановка планировщика.")
     except Exception as exc:
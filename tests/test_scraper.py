@@ -6,9 +6,18 @@
 
 import sys
 import os
-from typing import Iterator
+import sqlite3
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, Optional
 import pytest
-import requests
+import httpx
 
 current_dir = os.path.dirname(__file__)
 parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
@@ -16,37 +25,108 @@ sys.path.insert(0, parent_dir)
 
 
 try:
-    from scraper import get_book_data, scrape_books, BookData  # <--- BookData ТЕПЕРЬ ИСПОЛЬЗУЕТСЯ
+    import scraper
+    from scraper import (get_book_data, scrape_books, next_run_time,
+                         BookData)  # <--- BookData ТЕПЕРЬ ИСПОЛЬЗУЕТСЯ
 except ImportError:
     print("Ошибка: Не удалось импортировать 'scraper.py'.")
     print(f"Ожидаемый путь к файлу: {parent_dir}/scraper.py")
     sys.exit(1)
 
 
-@pytest.fixture(scope="module")
-def session() -> Iterator[requests.Session]:
+LIGHT_URL = ('http://books.toscrape.com/catalogue/'
+             'a-light-in-the-attic_1000/index.html')
+
+
+def fetch_book_data(book_url: str,
+                    executor: Optional[Executor] = None) -> BookData:
     """
-    Pytest-фикстура, которая создает одну requests.Session для всех тестов
-    в этом модуле. Это экономит ресурсы (переиспользование соединения).
+    Запускает асинхронную get_book_data в собственном цикле событий
+    с отдельным клиентом httpx. Если передан executor, разбор HTML
+    выполняется в нём.
     """
-    print("\n[Fixture] Создание сессии requests...")
-    with requests.Session() as s:
-        s.headers.update({
+    async def run() -> BookData:
+        async with httpx.AsyncClient(http2=True, headers={
             'User-Agent': 'Pytest Scraper Test'
-        })
-        yield s
-    print("\n[Fixture] Закрытие сессии requests.")
+        }) as client:
+            return await get_book_data(client, book_url, executor)
+
+    return asyncio.run(run())
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """
+    Обработчик статических файлов, который не пишет журнал запросов в вывод.
+    """
+    def log_message(self, *args: Any) -> None:  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def local_site(tmp_path: Path,
+               monkeypatch: pytest.MonkeyPatch) -> Iterator[ThreadingHTTPServer]:
+    """
+    Pytest-фикстура, которая поднимает локальную копию каталога
+    (одна страница, две книги) и направляет на неё scraper.
+    Кэш HTTP создаётся во временной папке.
+    """
+    site_dir = tmp_path / 'site'
+    (site_dir / 'catalogue').mkdir(parents=True)
+    (site_dir / 'index.html').write_text('<html><body>Home</body></html>')
+
+    links = ''.join(
+        f'<article class="product_pod"><h3><a href="book-{i}/index.html">'
+        f'Book {i}</a></h3></article>'
+        for i in range(2)
+    )
+    (site_dir / 'catalogue' / 'page-1.html').write_text(
+        f'<html><body>{links}<ul class="pager">'
+        f'<li class="current">Page 1 of 1</li></ul></body></html>')
+    for i in range(2):
+        book_dir = site_dir / 'catalogue' / f'book-{i}'
+        book_dir.mkdir()
+        (book_dir / 'index.html').write_text(
+            f'<html><body><h1>Book {i}</h1>'
+            f'<p class="price_color">10.00</p></body></html>')
+
+    # Страницы "изменены" месяц назад: по Last-Modified кэш считает их
+    # свежими ещё несколько дней, как и для реального сайта
+    month_ago = datetime.now().timestamp() - 30 * 24 * 3600
+    for path in site_dir.rglob('*.html'):
+        os.utime(path, (month_ago, month_ago))
+
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', 0), partial(QuietHandler, directory=str(site_dir)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    monkeypatch.setattr(scraper, 'BASE_URL', base_url)
+    monkeypatch.setattr(scraper, 'CATALOGUE_URL_TEMPLATE',
+                        base_url + '/catalogue/page-{}.html')
+    monkeypatch.setattr(scraper, 'ARTIFACTS_DIR', str(tmp_path))
+    monkeypatch.setattr(scraper, 'CACHE_PATH', str(tmp_path / 'cache.sqlite'))
+
+    yield server
+    server.shutdown()
+    server.server_close()
 
 
-def test_get_book_data_parsing(session: requests.Session) -> None:
+@pytest.fixture(scope="module")
+def light_in_attic() -> BookData:
+    """
+    Pytest-фикстура, которая загружает и разбирает страницу
+    "A Light in the Attic" один раз для всех тестов в этом модуле.
+    """
+    print("\n[Fixture] Загрузка страницы книги...")
+    return fetch_book_data(LIGHT_URL)
+
+
+def test_get_book_data_parsing(light_in_attic: BookData) -> None:
     """
     Тест 1: Проверяем, что get_book_data корректно парсит
     конкретную, известную страницу книги.
     """
-    book_url = ('http://books.toscrape.com/catalogue/'
-                'a-light-in-the-attic_1000/index.html')
-
-    data: BookData = get_book_data(session, book_url)
+    data = light_in_attic
 
     # Проверка, что данные не пустые
     assert data is not None
@@ -58,7 +138,7 @@ def test_get_book_data_parsing(session: requests.Session) -> None:
     assert data['rating'] == 3
     assert data['price'] == '£51.77'
     assert data['UPC'] == 'a897fe39b1053632'
-    assert data['url'] == book_url
+    assert data['url'] == LIGHT_URL
 
     stock_value = data.get('stock')
     assert isinstance(stock_value, str)
@@ -85,14 +165,154 @@ def test_scrape_books_page_limit() -> None:
     assert 'Tipping the Velvet' in titles
 
 
-def test_get_book_data_network_error(session: requests.Session) -> None:
+def test_get_book_data_network_error() -> None:
     """
     Тест 3: Проверяем, что get_book_data корректно обрабатывает
     ошибку (например, 404) и возвращает пустой словарь.
     """
     invalid_url = 'http://books.toscrape.com/catalogue/non-existent-book-9999.html'
 
-    data: BookData = get_book_data(session, invalid_url)
+    data: BookData = fetch_book_data(invalid_url)
 
     # Ожидаем пустой словарь в случае ошибки
     assert data == {}
+
+
+def test_get_book_data_description(light_in_attic: BookData) -> None:
+    """
+    Тест 4: Проверяем, что описание книги извлекается из абзаца
+    после блока product_description (страница не загружается повторно).
+    """
+    description = light_in_attic.get('description')
+
+    assert isinstance(description, str)
+    assert 'A Light in the Attic' in description
+
+
+def test_next_run_time() -> None:
+    """
+    Тест 5: Проверяем, что планировщик выбирает ближайшее время запуска
+    и переносит уже прошедшие времена на следующий день.
+    """
+    run_times = [time(12, 0), time(18, 30)]
+
+    assert next_run_time(run_times, datetime(2025, 1, 1, 9, 0)) == \
+        datetime(2025, 1, 1, 12, 0)
+    assert next_run_time(run_times, datetime(2025, 1, 1, 12, 0)) == \
+        datetime(2025, 1, 1, 18, 30)
+    assert next_run_time(run_times, datetime(2025, 1, 1, 20, 0)) == \
+        datetime(2025, 1, 2, 12, 0)
+
+
+def test_scrape_books_site_down_after_cached_run(
+        local_site: ThreadingHTTPServer) -> None:
+    """
+    Тест 6: Проверяем, что кэш HTTP не скрывает недоступность сайта:
+    после успешного запуска сайт выключается, и повторный запуск
+    должен вернуть пустой список, а не данные из кэша.
+    """
+    assert len(scrape_books(max_pages=1)) == 2
+
+    local_site.shutdown()
+    local_site.server_close()
+
+    assert scrape_books(max_pages=1) == []
+
+
+@pytest.mark.usefixtures('local_site')
+def test_scrape_books_revalidates_cached_pages(tmp_path: Path) -> None:
+    """
+    Тест 7: Проверяем, что закэшированные страницы перепроверяются
+    на сервере: изменённая после первого запуска цена должна попасть
+    в результат повторного запуска.
+    """
+    first_run = {book['title']: book['price']
+                 for book in scrape_books(max_pages=1)}
+    assert first_run['Book 0'] == '10.00'
+
+    (tmp_path / 'site' / 'catalogue' / 'book-0' / 'index.html').write_text(
+        '<html><body><h1>Book 0</h1>'
+        '<p class="price_color">5.00</p></body></html>')
+
+    second_run = {book['title']: book['price']
+                  for book in scrape_books(max_pages=1)}
+    assert second_run['Book 0'] == '5.00'
+    assert second_run['Book 1'] == '10.00'
+
+
+@pytest.mark.usefixtures('local_site')
+def test_scrape_books_empty_catalogue_page(tmp_path: Path) -> None:
+    """
+    Тест 8: Проверяем, что пустая страница каталога (200 без тела)
+    не прерывает запуск исключением, а даёт пустой список книг.
+    """
+    (tmp_path / 'site' / 'catalogue' / 'page-1.html').write_text('')
+
+    assert scrape_books(max_pages=1) == []
+
+
+def test_get_book_data_empty_page(local_site: ThreadingHTTPServer,
+                                  tmp_path: Path) -> None:
+    """
+    Тест 9: Проверяем, что get_book_data для пустой страницы книги
+    (200 без тела) возвращает пустой словарь, а не выбрасывает исключение,
+    как при разборе в текущем процессе, так и в пуле процессов.
+    """
+    (tmp_path / 'site' / 'catalogue' / 'book-0' / 'index.html').write_text('')
+    port = local_site.server_address[1]
+    book_url = f'http://127.0.0.1:{port}/catalogue/book-0/index.html'
+
+    assert fetch_book_data(book_url) == {}
+
+    with ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn')) as executor:
+        assert fetch_book_data(book_url, executor) == {}
+
+
+def test_get_book_data_separator_in_text(local_site: ThreadingHTTPServer,
+                                         tmp_path: Path) -> None:
+    """
+    Тест 10: Проверяем, что символ-разделитель полей (U+241F) в тексте
+    страницы не сдвигает поля книги.
+    """
+    (tmp_path / 'site' / 'catalogue' / 'book-0' / 'index.html').write_text(
+        '<html><head><meta charset="utf-8"></head>'
+        '<body><h1>Book \u241f 0</h1>'
+        '<p class="price_color">10.00</p>'
+        '<p class="star-rating Two"></p></body></html>',
+        encoding='utf-8')
+    port = local_site.server_address[1]
+
+    data = fetch_book_data(
+        f'http://127.0.0.1:{port}/catalogue/book-0/index.html')
+
+    assert data['title'] == 'Book \u241f 0'
+    assert data['price'] == '10.00'
+    assert data['rating'] == 2
+
+
+@pytest.mark.usefixtures('local_site')
+def test_scrape_books_cache_does_not_grow(tmp_path: Path) -> None:
+    """
+    Тест 11: Проверяем, что кэш HTTP не растёт при изменении страниц:
+    после нескольких запусков с изменённой ценой в нём остаётся по одной
+    записи на каждый URL (страница каталога и две книги).
+    """
+    book_page = tmp_path / 'site' / 'catalogue' / 'book-0' / 'index.html'
+    modified = datetime.now().timestamp() - 3 * 24 * 3600
+    for price in ('10.00', '5.00', '7.00'):
+        book_page.write_text('<html><body><h1>Book 0</h1>'
+                             f'<p class="price_color">{price}</p></body></html>')
+        # Каждое изменение получает свой Last-Modified (с точностью до секунды)
+        modified += 60
+        os.utime(book_page, (modified, modified))
+
+        prices = {book['title']: book['price']
+                  for book in scrape_books(max_pages=1)}
+        assert prices['Book 0'] == price
+
+    with sqlite3.connect(tmp_path / 'cache.sqlite') as connection:
+        (entries,), = connection.execute('SELECT COUNT(*) FROM entries')
+    connection.close()
+    assert entries == 3